@@ -1,142 +1,241 @@
 import os
-import random
+
+import numpy as np
+
+# Numba is optional: when available, the remaining scalar sampling loop is
+# JIT-compiled; otherwise the same function runs as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Single NumPy generator shared by the vectorized routines, seeded for replicability.
+rng = np.random.default_rng(42)
+
+def _fisher_yates_prefix(scratch, draws):
+    """
+    Performs a partial Fisher-Yates shuffle of `scratch` and returns its
+    first len(draws) entries.
+
+    The uniforms in `draws` are generated by the caller, so the loop body is
+    pure index arithmetic and swaps - exactly the shape of code Numba can
+    compile - and the result is identical with or without the JIT.
+    """
+    n = scratch.shape[0]
+    k = draws.shape[0]
+    for t in range(k):
+        r = t + int(draws[t] * (n - t))
+        tmp = scratch[t]
+        scratch[t] = scratch[r]
+        scratch[r] = tmp
+    return scratch[:k]
+
+if njit is not None:
+    _fisher_yates_prefix = njit(cache=True)(_fisher_yates_prefix)
+
+def _pick_covers_per_element(n, num_covers):
+    """
+    Builds an n x n boolean incidence matrix (rows = subsets, columns = elements)
+    where column `element` has exactly `num_covers[element]` True entries,
+    chosen uniformly at random.
+
+    Drawing one uniform matrix and taking the k smallest values per row via
+    argpartition picks the covers for all elements in bulk, instead of calling
+    random.sample once per element.
+    """
+    k_max = int(num_covers.max())
+    # Row `element` of `candidates` holds k_max distinct subset indices.
+    candidates = np.argpartition(rng.random((n, n)), kth=k_max - 1, axis=1)[:, :k_max]
+    # Keep only the first k entries of each row (k varies per element).
+    keep = np.arange(k_max) < num_covers[:, None]
+    elements, positions = np.nonzero(keep)
+    M = np.zeros((n, n), dtype=bool)
+    M[candidates[elements, positions], elements] = True
+    return M
 
 def _generate_sparse_sets(n):
     """Generates sets where each element is covered by few other sets."""
-    subsets = [set() for _ in range(n)]
     # For each element, choose a small number of sets to add it to.
-    for element in range(n):
-        num_covers = random.randint(2, 4)
-        # Ensure we can select enough unique sets.
-        num_covers = min(num_covers, n)
-        covering_sets_indices = random.sample(range(n), num_covers)
-        for index in covering_sets_indices:
-            subsets[index].add(element)
-    return subsets
+    num_covers = rng.integers(2, 5, size=n)
+    # Ensure we can select enough unique sets.
+    np.minimum(num_covers, n, out=num_covers)
+    return _pick_covers_per_element(n, num_covers)
 
 def _generate_dense_sets(n):
     """Generates sets where each element is covered by many other sets."""
-    subsets = [set() for _ in range(n)]
+    min_covers = n // 5  # At least 20%
+    max_covers = n // 2  # At most 50%
     # For each element, choose a large number of sets to add it to.
-    for element in range(n):
-        min_covers = n // 5  # At least 20%
-        max_covers = n // 2  # At most 50%
-        num_covers = random.randint(min_covers, max_covers)
-        num_covers = min(num_covers, n)
-        covering_sets_indices = random.sample(range(n), num_covers)
-        for index in covering_sets_indices:
-            subsets[index].add(element)
-    return subsets
-    
+    num_covers = rng.integers(min_covers, max_covers + 1, size=n)
+    np.minimum(num_covers, n, out=num_covers)
+    return _pick_covers_per_element(n, num_covers)
+
+def _sample_distinct(n, k, scratch):
+    """
+    Returns k distinct values from range(n), switching algorithm on the
+    sampling ratio.
+
+    For small k a rejection draw into a set is cheapest. For large k the
+    rejection loop would retry too often, so a partial Fisher-Yates shuffle
+    over the reusable `scratch` array takes k swaps with no allocation.
+    Either way this avoids random.sample rebuilding a range object and
+    reservoir-sampling in Python on every call.
+    """
+    if k > n // 10:
+        return set(_fisher_yates_prefix(scratch, rng.random(k)).tolist())
+    picked = set()
+    while len(picked) < k:
+        picked.add(int(rng.integers(n)))
+    return picked
+
 def _generate_structured_sets(n):
     """Generates a few large 'hub' sets and many small, specialized sets."""
-    subsets = [set() for _ in range(n)]
-    
+    M = np.zeros((n, n), dtype=bool)
+    scratch = np.arange(n)
+
     # Designate ~10% of sets as large hubs
     num_hubs = max(1, n // 10)
-    hub_indices = random.sample(range(n), num_hubs)
-    
+    hub_indices = _sample_distinct(n, num_hubs, scratch)
+
+    # Draw every subset size up front: small sets cover 2-5 elements,
+    # then the hub rows are overridden with large sizes (20-50% of n)
+    sizes = rng.integers(2, min(5, n) + 1, size=n)
+    sizes[list(hub_indices)] = rng.integers(n // 5, n // 2 + 1, size=num_hubs)
+
+    # Track coverage incrementally while scattering: the sampled members are
+    # already at hand, so marking them costs nothing extra and the final
+    # check does not need another pass over the whole matrix.
+    covered = np.zeros(n, dtype=bool)
     for i in range(n):
-        if i in hub_indices:
-            # Hubs are large: cover 20-50% of elements
-            size = random.randint(n // 5, n // 2)
-            subsets[i] = set(random.sample(range(n), size))
-        else:
-            # Other sets are small: cover 2-5 elements
-            size = random.randint(2, 5)
-            subsets[i] = set(random.sample(range(n), min(size, n)))
-
-    # Final check: ensure every element is covered by at least one set
-    all_covered_elements = set.union(*subsets)
-    uncovered = set(range(n)) - all_covered_elements
-    for element in uncovered:
-        # Add any uncovered element to a random set
-        random_set_index = random.randint(0, n - 1)
-        subsets[random_set_index].add(element)
-        
-    return subsets
+        members = list(_sample_distinct(n, int(sizes[i]), scratch))
+        M[i, members] = True
+        covered[members] = True
+
+    # Final check: ensure every element is covered by at least one set by
+    # assigning each uncovered one to a random set in a single scatter.
+    uncovered = np.flatnonzero(~covered)
+    M[rng.integers(0, n, size=uncovered.size), uncovered] = True
+
+    return M
 
 def _generate_matrix_A(n):
     """Generates the upper-triangular matrix A with random coefficients."""
-    A = {}
-    for i in range(n):
-        for j in range(i, n):
-            # Use a non-trivial range that includes negative values
-            A[(i, j)] = random.randint(-20, 20)
+    # Use a non-trivial range that includes negative values
+    A = rng.integers(-20, 21, size=(n, n), dtype=np.int8)
+    # Zero the strictly lower triangle; only A[i][j] with j >= i is used.
+    A[np.tril_indices(n, k=-1)] = 0
     return A
 
-def _write_instance_to_file(n, subsets, A, file_path):
+def _write_instance_to_file(n, M, A, file_path):
     """Writes the generated instance data to a file in the specified format."""
+    # Assemble every line in memory first so the file is written with a
+    # single call instead of one small write (and syscall) per line.
+    lines = [str(n)]
+
+    # One np.nonzero pass yields both the subset sizes and the element
+    # lists: rows come back grouped by subset in row-major order, so the
+    # per-subset counts slice the flat column array into the output rows.
+    rows, cols = np.nonzero(M)
+    subset_sizes = np.bincount(rows, minlength=n)
+    lines.append(" ".join(np.char.mod("%d", subset_sizes)))
+
+    # The elements of each subset (1-indexed). np.nonzero returns column
+    # indices in ascending order within each row, so every output row is
+    # already sorted without an explicit sort call.
+    elements_1_indexed = np.char.mod("%d", cols + 1)
+    for chunk in np.split(elements_1_indexed, np.cumsum(subset_sizes[:-1])):
+        lines.append(" ".join(chunk))
+
+    # The upper triangular matrix A: gather the triangle into one flat
+    # array, format it with a single np.char.mod call, and split it back
+    # into rows of decreasing length (n, n-1, ..., 1).
+    triu_values = np.char.mod("%d", A[np.triu_indices(n)])
+    row_ends = np.cumsum(np.arange(n, 1, -1))
+    for chunk in np.split(triu_values, row_ends):
+        lines.append(" ".join(chunk))
+
     with open(file_path, 'w') as f:
-        # Write n
-        f.write(f"{n}\n")
-        
-        # Write the size of each subset
-        subset_sizes = [len(s) for s in subsets]
-        f.write(" ".join(map(str, subset_sizes)) + "\n")
-        
-        # Write the elements of each subset (1-indexed)
-        for s in subsets:
-            # Convert 0-indexed elements back to 1-indexed for the file
-            elements_1_indexed = sorted([e + 1 for e in s])
-            f.write(" ".join(map(str, elements_1_indexed)) + "\n")
-            
-        # Write the upper triangular matrix A
-        for i in range(n):
-            row_values = []
-            for j in range(i, n):
-                row_values.append(A.get((i, j), 0))
-            f.write(" ".join(map(str, row_values)) + "\n")
+        f.write("\n".join(lines) + "\n")
 
-def generate_instance(n, pattern, file_path):
+def build_instance(n, pattern):
     """
-    Main function to generate a single instance.
-    
+    Generates a single instance in memory.
+
     Args:
         n (int): The number of variables for the instance.
         pattern (str): The generation pattern ('sparse', 'dense', or 'structured').
-        file_path (str): The full path where the instance file will be saved.
+
+    Returns:
+        tuple: The boolean incidence matrix M (rows are subsets, columns are
+               elements) and the upper-triangular coefficient matrix A.
     """
     if pattern == 'sparse':
-        subsets = _generate_sparse_sets(n)
+        M = _generate_sparse_sets(n)
     elif pattern == 'dense':
-        subsets = _generate_dense_sets(n)
+        M = _generate_dense_sets(n)
     elif pattern == 'structured':
-        subsets = _generate_structured_sets(n)
+        M = _generate_structured_sets(n)
     else:
         raise ValueError("Unknown pattern type specified.")
-        
+
     A = _generate_matrix_A(n)
-    
-    _write_instance_to_file(n, subsets, A, file_path)
+
+    return M, A
+
+def generate_instance(n, pattern, file_path):
+    """
+    Main function to generate a single instance and save it to a file.
+
+    Args:
+        n (int): The number of variables for the instance.
+        pattern (str): The generation pattern ('sparse', 'dense', or 'structured').
+        file_path (str): The full path where the instance file will be saved.
+    """
+    M, A = build_instance(n, pattern)
+    _write_instance_to_file(n, M, A, file_path)
+
+def _generate_task(n, pattern, file_path, seed_seq):
+    """
+    Worker entry point for parallel generation.
+
+    Reseeds the module-level generator from the task's own SeedSequence, so
+    every instance is reproducible no matter which process picks it up or in
+    which order the tasks finish.
+    """
+    global rng
+    rng = np.random.default_rng(seed_seq)
+    generate_instance(n, pattern, file_path)
+    return os.path.basename(file_path)
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
-    # Set a seed for the random number generator to ensure replicability.
-    # Using the same seed will produce the exact same set of instances every time.
-    random.seed(42) 
+    import concurrent.futures
 
     n_values = [25, 50, 100, 200, 400]
     patterns = ['sparse', 'dense', 'structured']
-    
+
     # Get the directory of the current script to create the 'instances' subdir
     script_dir = os.path.dirname(os.path.abspath(__file__))
     instances_dir = os.path.join(script_dir, "instances")
-    
+
     # Create the 'instances' directory if it doesn't exist
     os.makedirs(instances_dir, exist_ok=True)
-    
+
     print(f"Generating 15 instances in '{instances_dir}'...")
-    
-    # Loop through all combinations of n and pattern to generate 15 instances
-    for n in n_values:
-        for p in patterns:
-            # Construct a descriptive filename
-            filename = f"instance_n{n}_{p}.txt"
-            full_path = os.path.join(instances_dir, filename)
-            
-            # Generate and save the instance
-            generate_instance(n, p, full_path)
-            print(f"  -> Created {filename}")
-            
+
+    # One task per (n, pattern) combination, each with its own child of a
+    # fixed root seed so the generated files are fully replicable.
+    tasks = [(n, p) for n in n_values for p in patterns]
+    child_seeds = np.random.SeedSequence(42).spawn(len(tasks))
+
+    # The combinations are independent, so generate them in parallel
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        futures = []
+        for (n, p), seed_seq in zip(tasks, child_seeds):
+            full_path = os.path.join(instances_dir, f"instance_n{n}_{p}.txt")
+            futures.append(
+                executor.submit(_generate_task, n, p, full_path, seed_seq))
+        for future in concurrent.futures.as_completed(futures):
+            print(f"  -> Created {future.result()}")
+
     print("\nInstance generation complete.")
\ No newline at end of file
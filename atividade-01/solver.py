@@ -2,8 +2,10 @@
 
 import gurobipy as gp
 from gurobipy import GRB
-import sys 
-import os 
+import numpy as np
+import concurrent.futures
+import sys
+import os
 import csv
 
 class MaxScQbfSolver:
@@ -29,7 +31,8 @@ class MaxScQbfSolver:
         print(f"--- Initializing Solver for: {self.instance_name} ---")
         try:
             # Parse the instance file and store data as instance attributes
-            self.n, self.subsets, self.A = self._parse_instance_file(file_path)
+            (self.n, self.subset_indptr,
+             self.subset_indices, self.A) = self._parse_instance_file(file_path)
             print(f"Successfully loaded instance with n = {self.n}.")
         except FileNotFoundError:
             print(f"Error: The file '{file_path}' was not found.")
@@ -38,15 +41,48 @@ class MaxScQbfSolver:
         except Exception as e:
             print(f"An error occurred while parsing the file: {e}")
             sys.exit(1)
-            
-        # Determine and create the output path for the solution CSV
+
+        self._setup_outputs()
+
+    @classmethod
+    def from_data(cls, n, M, A, instance_name):
+        """
+        Builds a solver directly from in-memory instance data (as produced by
+        generator.build_instance), skipping the file write/parse round-trip.
+
+        Args:
+            n (int): The number of variables for the instance.
+            M (np.ndarray): Boolean incidence matrix; M[i, k] is True when
+                            subset i contains element k.
+            A (np.ndarray): Upper-triangular coefficient matrix.
+            instance_name (str): Name used for console output and the CSV file.
+        """
+        solver = cls.__new__(cls)
+        solver.instance_path = None
+        solver.instance_name = instance_name
+
+        print(f"--- Initializing Solver for: {instance_name} (in-memory) ---")
+        solver.n = n
+        # np.nonzero walks the matrix in row-major order, which is exactly
+        # the CSR layout: column indices grouped by subset row.
+        solver.subset_indptr = np.concatenate(
+            ([0], np.cumsum(M.sum(axis=1, dtype=np.int64))))
+        solver.subset_indices = np.nonzero(M)[1].astype(np.int32)
+        solver.A = np.asarray(A)
+
+        solver._setup_outputs()
+        return solver
+
+    def _setup_outputs(self):
+        """Creates the solutions directory, derives the CSV output path and
+        initializes the Gurobi model placeholders."""
         script_dir = os.path.dirname(os.path.abspath(__file__))
         solutions_dir = os.path.join(script_dir, "solutions")
         os.makedirs(solutions_dir, exist_ok=True)
-        
+
         csv_filename = os.path.splitext(self.instance_name)[0] + '.csv'
         self.solution_csv_path = os.path.join(solutions_dir, csv_filename)
-        
+
         # Initialize placeholders for the Gurobi model and variables
         self.model = None
         self.x_vars = None
@@ -56,25 +92,32 @@ class MaxScQbfSolver:
         """
         Parses a MAX-SC-QBF instance file and returns the data in Python format.
         """
-        with open(file_path, 'r') as f:
-            lines = [line.strip() for line in f if line.strip()]
-
-        n = int(lines[0])
-        subsets = []
-        subset_lines = lines[2 : 2 + n]
-        for line in subset_lines:
-            elements = {int(element) - 1 for element in line.split()}
-            subsets.append(elements)
-
-        A = {}
-        matrix_lines = lines[2 + n :]
-        for i, line in enumerate(matrix_lines):
-            coefficients = [int(c) for c in line.split()]
-            for k, coeff in enumerate(coefficients):
-                j = i + k
-                if coeff != 0:
-                    A[(i, j)] = coeff
-        return n, subsets, A
+        # The file is nothing but whitespace-separated integers, so read it
+        # in binary and tokenize the whole thing with one split. The section
+        # sizes are all implied by n and the sizes row, which makes the line
+        # structure (including blank rows for empty subsets) irrelevant.
+        with open(file_path, 'rb') as f:
+            tokens = f.read().split()
+
+        n = int(tokens[0])
+
+        # Store the subsets in CSR layout: one flat array of (0-indexed)
+        # elements plus an index pointer array, so subset i occupies
+        # indices[indptr[i]:indptr[i+1]].
+        sizes = np.array(tokens[1 : 1 + n], dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(sizes)))
+        total = int(indptr[-1])
+        indices = np.array(tokens[1 + n : 1 + n + total], dtype=np.int32) - 1
+
+        # Store A as a contiguous upper-triangular array; zeros stay implicit
+        # and the nonzero entries are recovered with np.argwhere when needed.
+        # int8 is enough: the generator draws coefficients in [-20, 20].
+        num_triangle = n * (n + 1) // 2
+        if len(tokens) != 1 + n + total + num_triangle:
+            raise ValueError("File length does not match the declared sizes.")
+        A = np.zeros((n, n), dtype=np.int8)
+        A[np.triu_indices(n)] = np.array(tokens[1 + n + total :], dtype=np.int8)
+        return n, indptr, indices, A
 
     def _build_model(self):
         """Builds the Gurobi optimization model, including variables,
@@ -83,46 +126,60 @@ class MaxScQbfSolver:
         # Initialize the Gurobi model object
         self.model = gp.Model("MAX-SC-QBF")
 
-        # Add decision variables
-        self.x_vars = self.model.addVars(self.n, vtype=GRB.BINARY, name="x")
-        self.y_vars = self.model.addVars(self.A.keys(), vtype=GRB.BINARY, name="y")
+        # Derive the nonzero coefficient positions once as flat index arrays;
+        # y variable t linearizes the product x[rows[t]] * x[cols[t]]
+        nonzero = np.argwhere(self.A != 0)
+        rows, cols = nonzero[:, 0], nonzero[:, 1]
 
-        # Set the objective function
-        self.model.setObjective(self.y_vars.prod(self.A), GRB.MAXIMIZE)
+        # Add decision variables as flat matrix variables, no tuple-dict keys
+        self.x_vars = self.model.addMVar(self.n, vtype=GRB.BINARY, name="x")
+        self.y_vars = self.model.addMVar(rows.size, vtype=GRB.BINARY, name="y")
 
-        # Set Covering Constraints
-        for k in range(self.n):
-            self.model.addConstr(gp.quicksum(self.x_vars[i] for i, s in enumerate(self.subsets) if k in s) >= 1)
-        
-        # Linearization Constraints        
-        for i, j in self.y_vars.keys():
-            self.model.addConstr(self.y_vars[i, j] <= self.x_vars[i])
-            self.model.addConstr(self.y_vars[i, j] <= self.x_vars[j])
-            self.model.addConstr(self.y_vars[i, j] >= self.x_vars[i] + self.x_vars[j] - 1)
+        # Set the objective function as one dot product over the flat arrays
+        self.model.setObjective(self.A[rows, cols] @ self.y_vars, GRB.MAXIMIZE)
+
+        # Set Covering Constraints in matrix form: C[k, i] = 1 iff element k
+        # is in subset i, so C @ x >= 1 covers every element. The CSR arrays
+        # give the scatter coordinates directly: repeat each subset index by
+        # its size to pair it with its slice of element indices.
+        subset_of = np.repeat(np.arange(self.n), np.diff(self.subset_indptr))
+        C = np.zeros((self.n, self.n))
+        C[self.subset_indices, subset_of] = 1
+        self.model.addConstr(C @ self.x_vars >= 1, name="cover")
+
+        # Linearization Constraints: fancy-indexing x with the row/column
+        # arrays expresses each family as a single vectorized constraint
+        x_i = self.x_vars[rows]
+        x_j = self.x_vars[cols]
+        self.model.addConstr(self.y_vars <= x_i, name="lin_i")
+        self.model.addConstr(self.y_vars <= x_j, name="lin_j")
+        self.model.addConstr(self.y_vars >= x_i + x_j - 1, name="lin_and")
             
         # Update model to reflect changes, ensuring NumVars and NumConstrs are correct
         self.model.update()
 
-    def solve(self, time_limit=None):
+    def solve(self, time_limit=None, threads=None):
         """
         Builds and solves the model, then reports the results.
-        
+
         Args:
             time_limit (int, optional): The time limit for the solver in seconds.
                                         Defaults to None (no limit).
+            threads (int, optional): Number of threads Gurobi may use.
+                                     Defaults to None (Gurobi decides, which
+                                     means all available cores).
         """
         # Build the model structure
         self._build_model()
-        
+
         if time_limit:
             self.model.Params.TimeLimit = time_limit
 
-        # Tell Gurobi to focus on finding good feasible solutions quickly.
-        self.model.Params.MIPFocus = 1
-        
-        # Tell Gurobi to spend 10% of its time on heuristics.
-        self.model.Params.Heuristics = 0.1            
-        
+        if threads:
+            self.model.Params.Threads = threads
+
+        self._configure_solver_params()
+
         # Suppress Gurobi's console output for cleaner experiment logs
         self.model.Params.OutputFlag = 0
         self.model.optimize()
@@ -131,13 +188,34 @@ class MaxScQbfSolver:
         self._report_results()
         self._save_results_to_csv()
 
+    def _configure_solver_params(self):
+        """
+        Tunes Gurobi parameters based on the instance size.
+
+        Small instances solve to optimality in seconds with the default
+        settings, so they are left alone. Larger ones usually exhaust the
+        time limit and are judged by the incumbent, so presolve is made
+        aggressive (the linearization adds three constraints per nonzero
+        coefficient, many of which presolve can remove) and the search is
+        biased toward finding good feasible solutions early.
+        """
+        if self.n >= 100:
+            # Aggressively shrink the model before branch-and-bound starts.
+            self.model.Params.Presolve = 2
+
+            # Tell Gurobi to focus on finding good feasible solutions quickly.
+            self.model.Params.MIPFocus = 1
+
+            # Tell Gurobi to spend 10% of its time on heuristics.
+            self.model.Params.Heuristics = 0.1
+
     def _report_results(self):
         """Prints a summary of the solution found by Gurobi to the console."""
         status = self.model.Status
         if status == GRB.OPTIMAL:
             print(f"-> Optimal solution found. Objective: {self.model.ObjVal:g}")
 
-            selected_subsets = [i + 1 for i in range(self.n) if self.x_vars[i].X > 0.5]
+            selected_subsets = (np.flatnonzero(self.x_vars.X > 0.5) + 1).tolist()
             print(f"\nSelected Subsets: {selected_subsets}")
 
         elif status == GRB.TIME_LIMIT:
@@ -174,6 +252,25 @@ class MaxScQbfSolver:
             print(f"Error writing to CSV file: {e}")
 
 
+# Number of instances solved concurrently by the parallel driver
+MAX_PARALLEL_SOLVES = 2
+
+
+def _solve_instance_file(instance_path):
+    """Worker entry point for the parallel driver: solves one instance file
+    with the standard 10-minute time limit.
+
+    Each concurrent solve gets an equal share of the machine's cores, so
+    the workers split the hardware instead of every Gurobi instance
+    spawning a thread per core and contending for all of them (which would
+    inflate the runtimes recorded in the CSVs).
+    """
+    threads = max(1, (os.cpu_count() or 1) // MAX_PARALLEL_SOLVES)
+    solver = MaxScQbfSolver(instance_path)
+    solver.solve(time_limit=600, threads=threads)
+    return solver.instance_name
+
+
 if __name__ == "__main__":
     # Get the script's directory and define paths for instances and solutions
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -198,24 +295,31 @@ if __name__ == "__main__":
         
     print(f"Found {len(instance_files)} instances to process.")
     print("="*40)
-    
-    # Loop through all instance files
+
+    # Collect the instances that still need solving
+    pending_paths = []
     for filename in instance_files:
         # Construct the expected path for the solution file
         solution_filename = os.path.splitext(filename)[0] + '.csv'
         solution_path = os.path.join(solutions_directory, solution_filename)
-        
+
         # Check if the solution file already exists
         if os.path.exists(solution_path):
             print(f"--- Skipping {filename} (solution already exists) ---")
             continue # Move to the next file
-        
-        # If no solution exists, proceed with solving the instance
-        instance_path = os.path.join(instances_directory, filename)
-        
-        # Instantiate and run the solver for the current instance
-        solver = MaxScQbfSolver(instance_path)
-        solver.solve(time_limit=600) # 10-minute time limit
-        print("-" * 40)
-        
+
+        pending_paths.append(os.path.join(instances_directory, filename))
+
+    # Solve the remaining instances in parallel, one process per instance.
+    # Two workers is a deliberate compromise: each solve caps Gurobi at its
+    # share of the cores (see _solve_instance_file), and splitting the
+    # machine further would leave too few threads per instance.
+    if pending_paths:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=MAX_PARALLEL_SOLVES) as executor:
+            futures = [executor.submit(_solve_instance_file, path)
+                       for path in pending_paths]
+            for future in concurrent.futures.as_completed(futures):
+                print(f"--- Finished {future.result()} ---")
+
     print("All instances have been processed.")
\ No newline at end of file